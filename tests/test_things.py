@@ -5,6 +5,7 @@
 import contextlib
 import io
 import os
+import tempfile
 import unittest
 import unittest.mock
 
@@ -156,6 +157,11 @@ class ThingsCase(unittest.TestCase):  # noqa: V103 pylint: disable=R0904
         self.assertEqual(3, len(checklist_items))
         checklist_items = things.checklist_items("K9bx7h1xCJdevvyWardZDq")
         self.assertEqual(0, len(checklist_items))
+        checklist_items = things.Database().get_checklist_items_of_todos(
+            ["3Eva4XFof6zWb9iSfYy4ej", "K9bx7h1xCJdevvyWardZDq"]
+        )
+        self.assertEqual(3, len(checklist_items["3Eva4XFof6zWb9iSfYy4ej"]))
+        self.assertEqual(0, len(checklist_items["K9bx7h1xCJdevvyWardZDq"]))
 
     def test_anytime(self):
         tasks = things.anytime()
@@ -211,6 +217,18 @@ class ThingsCase(unittest.TestCase):  # noqa: V103 pylint: disable=R0904
         self.assertEqual(5, len(tags))
         tag = things.tags(title="Errand")
         self.assertEqual("Errand", tag["title"])  # type: ignore
+        database = things.Database()
+        tag_titles = database.get_tag_titles()
+        self.assertIs(tag_titles, database.get_tag_titles())
+        database.close()
+        self.assertIsNot(tag_titles, database.get_tag_titles())
+        self.assertEqual(tag_titles, database.get_tag_titles())
+        task = things.tasks(tag="Errand")[0]
+        tags = database.get_tags_of_tasks([task["uuid"], "invalid_uuid"])
+        self.assertEqual({task["uuid"]: task["tags"], "invalid_uuid": []}, tags)
+        area = things.areas(tag="Errand")[0]
+        tags = database.get_tags_of_areas([area["uuid"], "invalid_uuid"])
+        self.assertEqual({area["uuid"]: area["tags"], "invalid_uuid": []}, tags)
 
     def test_get_link(self):
         link = things.link("uuid")
@@ -238,6 +256,27 @@ class ThingsCase(unittest.TestCase):  # noqa: V103 pylint: disable=R0904
         version = things.Database().get_version()
         self.assertEqual(18, version)
 
+    def test_database_connection(self):
+        database = things.Database()
+        connection = database.connect()
+        database.get_tags()
+        self.assertIs(connection, database.connect())
+        database.close()
+        self.assertIsNot(connection, database.connect())
+        connection = database.connect()
+        with unittest.mock.patch("os.getpid", return_value=-1):  # as if forked
+            self.assertIsNot(connection, database.connect())
+        connection.close()
+        database.close()
+
+    def test_database_moved(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, "main.sqlite")
+            with open(filepath, "w", encoding="utf-8") as file:
+                file.write("Your database file has been moved there\n")
+            database = things.Database(filepath=filepath)
+        self.assertEqual(things.database.DEFAULT_FILEPATH, database.filepath)  # type: ignore
+
     def test_last(self):
         last_tasks = things.last("0d")
         self.assertEqual(len(last_tasks), 0)
@@ -270,6 +309,14 @@ class ThingsCase(unittest.TestCase):  # noqa: V103 pylint: disable=R0904
         count = things.last("1y", tag="Important", status="completed", count_only=True)
         self.assertEqual(count, 0)
 
+        # 0 and 1 are accepted as False and True
+        kwargs = {"status": None, "count_only": True}
+        for value in (False, True):
+            self.assertEqual(
+                things.tasks(deadline_suppressed=value, **kwargs),
+                things.tasks(deadline_suppressed=int(value), **kwargs),
+            )
+
         # get task by uuid
         count = things.tasks(uuid="5pUx6PESj3ctFYbgth1PXY", count_only=True)
         self.assertEqual(count, 1)
@@ -287,8 +334,8 @@ class ThingsCase(unittest.TestCase):  # noqa: V103 pylint: disable=R0904
         tasks = things.tasks(area="'")
         self.assertEqual(len(tasks), 0)
 
-        with self.assertRaises(ValueError):
-            things.tasks(area="\0")
+        tasks = things.tasks(area="\0")
+        self.assertEqual(len(tasks), 0)
 
     def test_database_details(self):
         output = io.StringIO()
@@ -302,6 +349,7 @@ class ThingsCase(unittest.TestCase):  # noqa: V103 pylint: disable=R0904
             database.debug = True
             database.get_tags()
         self.assertTrue("/* Filepath" in output.getvalue())
+        self.assertTrue("/* Plan: " in output.getvalue())
 
     @unittest.mock.patch("os.system")
     def test_api_show(self, os_system):  # pylint: disable=R0201
@@ -199,13 +199,21 @@ def tasks(uuid=None, include_items=False, **kwargs):  # noqa: C901
     if uuid:
         include_items = True
 
-    for task in result:
-        # TK: How costly of an operation is it to do this for every task?
-        # IF costly, then can it be made significantly more efficient
-        # by optimizing SQL calls?
+    # Fetch tags and checklists of all tasks at once instead of per task.
+    tags_of_tasks = database.get_tags_of_tasks(
+        task["uuid"] for task in result if task.get("tags")
+    )
+    checklist_items_of_todos = {}
+    if include_items:
+        checklist_items_of_todos = database.get_checklist_items_of_todos(
+            task["uuid"]
+            for task in result
+            if task["type"] == "to-do" and task.get("checklist")
+        )
 
+    for task in result:
         if task.get("tags"):
-            task["tags"] = database.get_tags(task=task["uuid"])
+            task["tags"] = tags_of_tasks[task["uuid"]]
 
         if not include_items:
             continue
@@ -213,7 +221,7 @@ def tasks(uuid=None, include_items=False, **kwargs):  # noqa: C901
         # include items
         if task["type"] == "to-do":
             if task.get("checklist"):
-                task["checklist"] = database.get_checklist_items(task["uuid"])
+                task["checklist"] = checklist_items_of_todos[task["uuid"]]
         elif task["type"] == "project":
             project = task
             project["items"] = items = tasks(
@@ -296,9 +304,14 @@ def areas(uuid=None, include_items=False, **kwargs):
     if kwargs.get("count_only"):
         return result
 
+    # Fetch tags of all areas at once instead of per area.
+    tags_of_areas = database.get_tags_of_areas(
+        area["uuid"] for area in result if area.get("tags")
+    )
+
     for area in result:
         if area.get("tags"):
-            area["tags"] = database.get_tags(area=area["uuid"])
+            area["tags"] = tags_of_areas[area["uuid"]]
         if include_items:
             area["items"] = tasks(
                 area=area["uuid"], include_items=True, database=database
@@ -1,7 +1,12 @@
 """Read from the Things SQLite database using SQL queries."""
 
+# The query builders and row converters belong with the queries that
+# use them, which makes this module longer than pylint's default limit.
+# pylint: disable=C0302
+
+from datetime import date, datetime, time, timedelta, timezone
+import functools
 import os
-import plistlib
 import re
 import sqlite3
 from textwrap import dedent
@@ -21,6 +26,15 @@ DEFAULT_FILEPATH = os.path.expanduser(
 
 ENVIRONMENT_VARIABLE_WITH_FILEPATH = "THINGSDB"
 
+# Every SQLite database file starts with this header.
+SQLITE_FILE_HEADER = b"SQLite format 3\x00"
+
+# Resolved database filepaths, with the modification time they were read at
+RESOLVED_FILEPATHS = {}  # type: ignore
+
+# Database versions by filepath, with the modification time they were read at
+DATABASE_VERSIONS = {}  # type: ignore
+
 # Translate app language to database language
 
 START_TO_FILTER = {
@@ -41,12 +55,43 @@ TYPE_TO_FILTER = {"to-do": "type = 0", "project": "type = 1", "heading": "type =
 
 # Dates
 
-DATES = ("future", "past", True, False)
+RELATIVE_DATE_TO_OPERATOR = {"future": ">=", "past": "<"}
+
+RELATIVE_DATES = tuple(RELATIVE_DATE_TO_OPERATOR)
+
+DATES = (*RELATIVE_DATES, True, False)
+
+# Days per unit of an offset like '3w'; years are subtracted on the calendar
+
+DAYS_PER_OFFSET_UNIT = {"d": 1, "w": 7}
+
+# SQLite's default limit of parameters per query before version 3.32
+
+MAX_SQL_PARAMETERS = 999
+
+# Settings for a read-only connection: map the database into memory,
+# allow a larger page cache, and keep temporary sort tables in memory.
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA query_only = ON",
+)
 
 # Indices
 
 INDICES = ("index", "todayIndex")
 
+# Valid arguments, built once rather than on every call
+
+VALID_BOOLS = (None, True, False)
+VALID_DATES = (None, *DATES)
+VALID_STARTS = (None, *START_TO_FILTER)
+VALID_STATUSES = (None, *STATUS_TO_FILTER)
+VALID_TRASHED = (None, *TRASHED_TO_FILTER)
+VALID_TYPES = (None, *TYPE_TO_FILTER)
+
 # Response modification
 
 COLUMNS_TO_OMIT_IF_NONE = (
@@ -61,6 +106,14 @@ COLUMNS_TO_OMIT_IF_NONE = (
     "tags",
 )
 COLUMNS_TO_TRANSFORM_TO_BOOL = ("checklist", "tags", "trashed")
+# Unix timestamps are converted to local time in Python rather than
+# by SQLite, which would resolve the local timezone for every row.
+COLUMNS_TO_TRANSFORM_TO_DATE = ("deadline", "start_date", "stop_date")
+COLUMNS_TO_TRANSFORM_TO_DATETIME = ("created", "modified")
+
+# SQL formatting
+
+EMPTY_LINE_PATTERN = re.compile(r"^$\n", flags=re.MULTILINE)
 
 # --------------------------------------------------
 # Table names
@@ -149,24 +202,19 @@ class Database:
     # pylint: disable=R0913
     def __init__(self, filepath=None, print_sql=False):
         """Set up the database."""
+        self._connection = None
+        self._connection_pid = None
+        self._tag_titles = None
         self.filepath = (
             filepath
             or os.getenv(ENVIRONMENT_VARIABLE_WITH_FILEPATH)
             or DEFAULT_FILEPATH
         )
         self.print_sql = print_sql
-        if self.print_sql:
-            self.execute_query_count = 0
+        self.execute_query_count = 0
 
         # Automated migration to new database location in Things 3.12.6/3.13.1
-        # --------------------------------
-        try:
-            with open(self.filepath) as file:
-                if "Your database file has been moved there" in file.readline():
-                    self.filepath = DEFAULT_FILEPATH
-        except (UnicodeDecodeError, FileNotFoundError, PermissionError):
-            pass  # binary file (old database) or doesn't exist
-        # --------------------------------
+        self.filepath = resolve_filepath(self.filepath)
 
     # Core methods
 
@@ -198,25 +246,21 @@ class Database:
         start = start and start.title()
 
         # Validation
-        validate("deadline", deadline, [None] + list(DATES))  # type: ignore
-        validate("deadline_suppressed", deadline_suppressed, [None, True, False])  # type: ignore
-        validate("start", start, [None] + list(START_TO_FILTER))  # type: ignore
-        validate("start_date", start_date, [None] + list(DATES))  # type: ignore
-        validate("status", status, [None] + list(STATUS_TO_FILTER))  # type: ignore
-        validate("trashed", trashed, [None] + list(TRASHED_TO_FILTER))  # type: ignore
-        validate("type", type, [None] + list(TYPE_TO_FILTER))  # type: ignore
-        validate("context_trashed", context_trashed, [None, True, False])
-        validate("index", index, list(INDICES))
+        validate("deadline", deadline, VALID_DATES)
+        validate("deadline_suppressed", deadline_suppressed, VALID_BOOLS)
+        validate("start", start, VALID_STARTS)
+        validate("start_date", start_date, VALID_DATES)
+        validate("status", status, VALID_STATUSES)
+        validate("trashed", trashed, VALID_TRASHED)
+        validate("type", type, VALID_TYPES)
+        validate("context_trashed", context_trashed, VALID_BOOLS)
+        validate("index", index, INDICES)
         validate_offset("last", last)
 
         if tag is not None:
-            valid_tags = self.get_tags(titles_only=True)
-            validate("tag", tag, [None] + list(valid_tags))
+            validate("tag", tag, (None, *self.get_tag_titles()))
 
         # Query
-        # TK: might consider executing SQL with parameters instead.
-        # See: https://docs.python.org/3/library/sqlite3.html#sqlite3.Cursor.execute
-
         start_filter = START_TO_FILTER.get(start, "")
         status_filter = STATUS_TO_FILTER.get(status, "")
         trashed_filter = TRASHED_TO_FILTER.get(trashed, "")
@@ -231,43 +275,53 @@ class Database:
             "PROJECT_OF_HEADING.trashed", context_trashed
         )
 
-        where_predicate = f"""
-            TASK.{IS_NOT_RECURRING}
-            {trashed_filter and f"AND TASK.{trashed_filter}"}
-            {project_trashed_filter}
-            {project_of_heading_trashed_filter}
-            {type_filter and f"AND TASK.{type_filter}"}
-            {start_filter and f"AND TASK.{start_filter}"}
-            {status_filter and f"AND TASK.{status_filter}"}
-            {make_filter('TASK.uuid', uuid)}
-            {make_filter("TASK.area", area)}
-            {make_filter("TASK.project", project)}
-            {make_filter("TASK.actionGroup", heading)}
-            {make_filter("TASK.dueDateSuppressionDate", deadline_suppressed)}
-            {make_filter("TAG.title", tag)}
-            {make_date_filter(f"TASK.{DATE_START}", start_date)}
-            {make_date_filter(f"TASK.{DATE_DEADLINE}", deadline)}
-            {make_date_range_filter(f"TASK.{DATE_CREATED}", last)}
-            {make_search_filter(search_query)}
-            """
-        order_predicate = f'TASK."{index}"'
+        filters = [
+            f"TASK.{IS_NOT_RECURRING}",
+            trashed_filter and f"AND TASK.{trashed_filter}",
+            project_trashed_filter,
+            project_of_heading_trashed_filter,
+            type_filter and f"AND TASK.{type_filter}",
+            start_filter and f"AND TASK.{start_filter}",
+            status_filter and f"AND TASK.{status_filter}",
+        ]
+
+        # Filters on user-provided values are bound as SQL parameters.
+        parameters = []
+        for bound_filter, values in (
+            make_filter("TASK.area", area),
+            make_filter("TASK.project", project),
+            make_filter("TASK.actionGroup", heading),
+            make_filter("TASK.dueDateSuppressionDate", deadline_suppressed),
+            make_date_filter(f"TASK.{DATE_START}", start_date),
+            make_date_filter(f"TASK.{DATE_DEADLINE}", deadline),
+            make_date_range_filter(f"TASK.{DATE_CREATED}", last),
+            make_tag_filter(tag),
+            make_search_filter(search_query),
+        ):
+            if bound_filter:  # most optional filters are unset
+                filters.append(bound_filter)
+                parameters.extend(values)
 
-        sql_query = make_tasks_sql_query(where_predicate, order_predicate)
+        where_predicate = join_filters(filters)
+        order_predicate = f'TASK."{index}"'
 
         if count_only:
-            return self.get_count(sql_query)
+            sql_query = make_tasks_count_sql_query(where_predicate)
+            return self.get_count_of(sql_query, tuple(parameters))
 
-        return self.execute_query(sql_query)
+        sql_query = make_tasks_sql_query(where_predicate, order_predicate)
+        return self.execute_query(sql_query, tuple(parameters))
 
     def get_task_by_uuid(self, uuid, count_only=False):
         """Get a task by uuid. Raise `ValueError` if not found."""
         where_predicate = "TASK.uuid = ?"
-        sql_query = make_tasks_sql_query(where_predicate)
         parameters = (uuid,)
 
         if count_only:
-            return self.get_count(sql_query, parameters)
+            sql_query = make_tasks_count_sql_query(where_predicate)
+            return self.get_count_of(sql_query, parameters)
 
+        sql_query = make_tasks_sql_query(where_predicate)
         result = self.execute_query(sql_query, parameters)
         if not result:
             raise ValueError(f"No such task uuid found: {uuid!r}")
@@ -278,8 +332,7 @@ class Database:
         """Get areas. See `api.areas` for details on parameters."""
         # Validation
         if tag is not None:
-            valid_tags = self.get_tags(titles_only=True)
-            validate("tag", tag, [None] + list(valid_tags))
+            validate("tag", tag, (None, *self.get_tag_titles()))
 
         if (
             uuid
@@ -289,65 +342,71 @@ class Database:
             raise ValueError(f"No such area uuid found: {uuid!r}")
 
         # Query
+        tag_filter, tag_parameters = make_area_tag_filter(tag)
+        uuid_filter, uuid_parameters = make_filter("AREA.uuid", uuid)
+        parameters = (*tag_parameters, *uuid_parameters)
+
+        where_predicate = join_filters(["TRUE", tag_filter, uuid_filter])
+
         sql_query = f"""
-            SELECT DISTINCT
+            SELECT
                 AREA.uuid,
                 'area' as type,
                 AREA.title,
                 CASE
-                    WHEN AREA_TAG.areas IS NOT NULL THEN 1
+                    WHEN EXISTS (
+                        SELECT 1 FROM {TABLE_AREATAG} WHERE areas = AREA.uuid
+                    ) THEN 1
                 END AS tags
             FROM
                 {TABLE_AREA} AS AREA
-            LEFT OUTER JOIN
-                {TABLE_AREATAG} AREA_TAG ON AREA_TAG.areas = AREA.uuid
-            LEFT OUTER JOIN
-                {TABLE_TAG} TAG ON TAG.uuid = AREA_TAG.tags
             WHERE
-                TRUE
-                {make_filter('TAG.title', tag)}
-                {make_filter('AREA.uuid', uuid)}
+                {where_predicate}
             ORDER BY AREA."index"
             """
 
         if count_only:
-            return self.get_count(sql_query)
+            return self.get_count(sql_query, parameters)
 
-        return self.execute_query(sql_query)
+        return self.execute_query(sql_query, parameters)
 
     def get_checklist_items(self, todo_uuid=None):
         """Get checklist items."""
-        sql_query = f"""
-            SELECT
-                CHECKLIST_ITEM.title,
-                CASE
-                    WHEN CHECKLIST_ITEM.{IS_INCOMPLETE} THEN 'incomplete'
-                    WHEN CHECKLIST_ITEM.{IS_CANCELED} THEN 'canceled'
-                    WHEN CHECKLIST_ITEM.{IS_COMPLETED} THEN 'completed'
-                END AS status,
-                date(CHECKLIST_ITEM.stopDate, "unixepoch", "localtime") AS stop_date,
-                'checklist-item' as type,
-                CHECKLIST_ITEM.uuid,
-                datetime(
-                    CHECKLIST_ITEM.{DATE_MODIFIED}, "unixepoch", "localtime"
-                ) AS created,
-                datetime(
-                    CHECKLIST_ITEM.{DATE_MODIFIED}, "unixepoch", "localtime"
-                ) AS modified
-            FROM
-                {TABLE_CHECKLIST_ITEM} AS CHECKLIST_ITEM
-            WHERE
-                CHECKLIST_ITEM.task = ?
-            ORDER BY CHECKLIST_ITEM."index"
-            """
-        return self.execute_query(sql_query, (todo_uuid,))
+        return self.get_checklist_items_of_todos([todo_uuid])[todo_uuid]
+
+    def get_checklist_items_of_todos(self, todo_uuids):
+        """Get checklist items of several to-dos in one query per batch."""
+        result = {todo_uuid: [] for todo_uuid in todo_uuids}
+        for batch in batched(result):
+            sql_query = f"""
+                SELECT
+                    CHECKLIST_ITEM.title,
+                    CASE
+                        WHEN CHECKLIST_ITEM.{IS_INCOMPLETE} THEN 'incomplete'
+                        WHEN CHECKLIST_ITEM.{IS_CANCELED} THEN 'canceled'
+                        WHEN CHECKLIST_ITEM.{IS_COMPLETED} THEN 'completed'
+                    END AS status,
+                    CHECKLIST_ITEM.stopDate AS stop_date,
+                    'checklist-item' as type,
+                    CHECKLIST_ITEM.uuid,
+                    CHECKLIST_ITEM.{DATE_MODIFIED} AS created,
+                    CHECKLIST_ITEM.{DATE_MODIFIED} AS modified,
+                    CHECKLIST_ITEM.task AS todo
+                FROM
+                    {TABLE_CHECKLIST_ITEM} AS CHECKLIST_ITEM
+                WHERE
+                    CHECKLIST_ITEM.task IN ({make_placeholders(batch)})
+                ORDER BY CHECKLIST_ITEM."index"
+                """
+            for item in self.execute_query(sql_query, batch):
+                result[item.pop("todo")].append(item)
+        return result
 
     def get_tags(self, title=None, area=None, task=None, titles_only=False):
         """Get tags. See `api.tags` for details on parameters."""
         # Validation
         if title is not None:
-            valid_titles = self.get_tags(titles_only=True)
-            validate("title", title, [None] + list(valid_titles))
+            validate("title", title, (None, *self.get_tag_titles()))
 
         # Query
         if task:
@@ -356,8 +415,10 @@ class Database:
             return self.get_tags_of_area(area)
 
         if titles_only:
-            sql_query = f'SELECT title FROM {TABLE_TAG} ORDER BY "index"'
-            return self.execute_query(sql_query, row_factory=list_factory)
+            return list(self.get_tag_titles())
+
+        title_filter, parameters = make_filter("title", title)
+        where_predicate = join_filters(["TRUE", title_filter])
 
         sql_query = f"""
             SELECT
@@ -365,53 +426,96 @@ class Database:
             FROM
                 {TABLE_TAG}
             WHERE
-                TRUE
-                {make_filter('title', title)}
+                {where_predicate}
             ORDER BY "index"
             """
 
-        return self.execute_query(sql_query)
+        return self.execute_query(sql_query, parameters)
+
+    def get_tag_titles(self):
+        """
+        Get tag titles.
+
+        The result is cached on the database object until the database is
+        changed, for example by the Things app.
+        """
+        # See: https://sqlite.org/pragma.html#pragma_data_version
+        (data_version,) = self.connect().execute("PRAGMA data_version").fetchone()
+        if self._tag_titles is None or self._tag_titles[0] != data_version:
+            sql_query = f'SELECT title FROM {TABLE_TAG} ORDER BY "index"'
+            titles = tuple(self.execute_query(sql_query, row_factory=list_factory))
+            self._tag_titles = (data_version, titles)
+        return self._tag_titles[1]
 
     def get_tags_of_task(self, task_uuid):
         """Get tag titles of task."""
-        sql_query = f"""
-            SELECT
-                TAG.title
-            FROM
-                {TABLE_TASKTAG} AS TASK_TAG
-            LEFT OUTER JOIN
-                {TABLE_TAG} TAG ON TAG.uuid = TASK_TAG.tags
-            WHERE
-                TASK_TAG.tasks = ?
-            ORDER BY TAG."index"
-            """
-        return self.execute_query(
-            sql_query, parameters=(task_uuid,), row_factory=list_factory
-        )
+        return self.get_tags_of_tasks([task_uuid])[task_uuid]
+
+    def get_tags_of_tasks(self, task_uuids):
+        """Get tag titles of several tasks in one query per batch."""
+        result = {task_uuid: [] for task_uuid in task_uuids}
+        for batch in batched(result):
+            sql_query = f"""
+                SELECT
+                    TASK_TAG.tasks AS task, TAG.title
+                FROM
+                    {TABLE_TASKTAG} AS TASK_TAG
+                LEFT OUTER JOIN
+                    {TABLE_TAG} TAG ON TAG.uuid = TASK_TAG.tags
+                WHERE
+                    TASK_TAG.tasks IN ({make_placeholders(batch)})
+                ORDER BY TAG."index"
+                """
+            for row in self.execute_query(sql_query, batch):
+                result[row["task"]].append(row["title"])
+        return result
 
     def get_tags_of_area(self, area_uuid):
         """Get tag titles for area."""
-        sql_query = f"""
-            SELECT
-                AREA.title
-            FROM
-                {TABLE_AREATAG} AS AREA_TAG
-            LEFT OUTER JOIN
-                {TABLE_TAG} AREA ON AREA.uuid = AREA_TAG.tags
-            WHERE
-                AREA_TAG.areas = ?
-            ORDER BY AREA."index"
-            """
-        return self.execute_query(
-            sql_query, parameters=(area_uuid,), row_factory=list_factory
-        )
+        return self.get_tags_of_areas([area_uuid])[area_uuid]
+
+    def get_tags_of_areas(self, area_uuids):
+        """Get tag titles of several areas in one query per batch."""
+        result = {area_uuid: [] for area_uuid in area_uuids}
+        for batch in batched(result):
+            sql_query = f"""
+                SELECT
+                    AREA_TAG.areas AS area, TAG.title
+                FROM
+                    {TABLE_AREATAG} AS AREA_TAG
+                LEFT OUTER JOIN
+                    {TABLE_TAG} TAG ON TAG.uuid = AREA_TAG.tags
+                WHERE
+                    AREA_TAG.areas IN ({make_placeholders(batch)})
+                ORDER BY TAG."index"
+                """
+            for row in self.execute_query(sql_query, batch):
+                result[row["area"]].append(row["title"])
+        return result
 
     def get_version(self):
-        """Get Things Database version."""
-        sql_query = f"SELECT value FROM {TABLE_META} WHERE key = 'databaseVersion'"
-        result = self.execute_query(sql_query, row_factory=list_factory)
-        plist_bytes = result[0].encode()
-        return plistlib.loads(plist_bytes)
+        """
+        Get Things Database version.
+
+        The result is cached per filepath until the file is modified.
+        """
+        try:
+            mtime = os.stat(self.filepath).st_mtime_ns
+        except OSError:
+            mtime = None
+        cached_mtime, version = DATABASE_VERSIONS.get(self.filepath, (None, None))
+        if version is None or cached_mtime != mtime:
+            # Only needed here, so don't slow down `import things` with it.
+            import plistlib  # pylint: disable=C0415
+
+            sql_query = f"SELECT value FROM {TABLE_META} WHERE key = ?"
+            result = self.execute_query(
+                sql_query, parameters=("databaseVersion",), row_factory=list_factory
+            )
+            plist_bytes = result[0].encode()
+            version = plistlib.loads(plist_bytes)
+            DATABASE_VERSIONS[self.filepath] = (mtime, version)
+        return version
 
     # pylint: disable=R1710
     def get_url_scheme_auth_token(self):
@@ -422,14 +526,20 @@ class Database:
             FROM
                 {TABLE_SETTINGS}
             WHERE
-                uuid = 'RhAzEf6qDxCD5PmnZVtBZR'
+                uuid = ?
             """
-        rows = self.execute_query(sql_query, row_factory=list_factory)
+        rows = self.execute_query(
+            sql_query, parameters=("RhAzEf6qDxCD5PmnZVtBZR",), row_factory=list_factory
+        )
         return rows[0]
 
     def get_count(self, sql_query, parameters=()):
         """Count number of results."""
         count_sql_query = f"""SELECT COUNT(uuid) FROM (\n{sql_query}\n)"""
+        return self.get_count_of(count_sql_query, parameters)
+
+    def get_count_of(self, count_sql_query, parameters=()):
+        """Run a SQL query that selects a single count."""
         rows = self.execute_query(
             count_sql_query, row_factory=list_factory, parameters=parameters
         )
@@ -439,158 +549,323 @@ class Database:
     def execute_query(self, sql_query, parameters=(), row_factory=None):
         """Run the actual SQL query."""
         if self.print_sql or self.debug:
-            if not hasattr(self, "execute_query_count"):
-                # This is needed for historical `self.debug`.
-                # TK: might consider removing `debug` flag.
-                self.execute_query_count = 0
-            self.execute_query_count += 1
-            if self.debug:
-                print(f"/* Filepath {self.filepath!r} */")
-            print(f"/* Query {self.execute_query_count} */")
-            if parameters:
-                print(f"/* Parameters: {parameters!r} */")
-            print()
-            print(prettify_sql(sql_query))
-            print()
+            self.print_query(sql_query, parameters)
 
-        # "ro" means read-only
-        # See: https://sqlite.org/uri.html#recognized_query_parameters
-        uri = f"file:{self.filepath}?mode=ro"
-        connection = sqlite3.connect(uri, uri=True)  # pylint: disable=E1101
-        connection.row_factory = row_factory or dict_factory
-        cursor = connection.cursor()
+        cursor = self.connect().cursor()
         cursor.execute(sql_query, parameters)
+        cursor.row_factory = row_factory or make_dict_factory(cursor.description)
 
         return cursor.fetchall()
 
+    def print_query(self, sql_query, parameters=()):
+        """Print a SQL query before it is run."""
+        self.execute_query_count += 1
+        if self.debug:
+            print(f"/* Filepath {self.filepath!r} */")
+        print(f"/* Query {self.execute_query_count} */")
+        if parameters:
+            print(f"/* Parameters: {parameters!r} */")
+        print()
+        print(prettify_sql(sql_query))
+        print()
+        if self.debug:
+            # Shows how SQLite runs the query, e.g. whether sorting the
+            # result needs a temporary B-tree instead of an index.
+            plan_query = f"EXPLAIN QUERY PLAN {sql_query}"
+            for row in self.connect().execute(plan_query, parameters):
+                print(f"/* Plan: {row[-1]} */")
+            print()
+
+    def connect(self):
+        """Open a read-only connection to the database, or reuse it."""
+        if self._connection_pid != os.getpid():
+            # A forked process must not share its parent's connection.
+            self._connection = None
+        if self._connection is None:
+            # "ro" means read-only
+            # See: https://sqlite.org/uri.html#recognized_query_parameters
+            uri = f"file:{self.filepath}?mode=ro"
+            self._connection = sqlite3.connect(  # pylint: disable=E1101
+                uri, uri=True, check_same_thread=False, cached_statements=256
+            )
+            self._tag_titles = None  # data versions are per connection
+            for pragma in CONNECTION_PRAGMAS:
+                self._connection.execute(pragma)
+            self._connection_pid = os.getpid()
+        return self._connection
+
+    def close(self):
+        """Close the connection to the database, if any."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __del__(self):
+        """Close the connection when the database object is discarded."""
+        self.close()
+
 
 # Helper functions
 
 
+# The static parts of the tasks query are built and dedented once at import time.
+TASKS_SQL_SELECT = dedent(
+    f"""
+    SELECT
+        TASK.uuid,
+        CASE
+            WHEN TASK.{IS_TODO} THEN 'to-do'
+            WHEN TASK.{IS_PROJECT} THEN 'project'
+            WHEN TASK.{IS_HEADING} THEN 'heading'
+        END AS type,
+        CASE
+            WHEN TASK.{IS_TRASHED} THEN 1
+        END AS trashed,
+        TASK.title,
+        CASE
+            WHEN TASK.{IS_INCOMPLETE} THEN 'incomplete'
+            WHEN TASK.{IS_CANCELED} THEN 'canceled'
+            WHEN TASK.{IS_COMPLETED} THEN 'completed'
+        END AS status,
+        CASE
+            WHEN AREA.uuid IS NOT NULL THEN AREA.uuid
+        END AS area,
+        CASE
+            WHEN AREA.uuid IS NOT NULL THEN AREA.title
+        END AS area_title,
+        CASE
+            WHEN PROJECT.uuid IS NOT NULL THEN PROJECT.uuid
+        END AS project,
+        CASE
+            WHEN PROJECT.uuid IS NOT NULL THEN PROJECT.title
+        END AS project_title,
+        CASE
+            WHEN HEADING.uuid IS NOT NULL THEN HEADING.uuid
+        END AS heading,
+        CASE
+            WHEN HEADING.uuid IS NOT NULL THEN HEADING.title
+        END AS heading_title,
+        TASK.notes,
+        CASE
+            WHEN EXISTS (
+                SELECT 1 FROM {TABLE_TASKTAG} WHERE tasks = TASK.uuid
+            ) THEN 1
+        END AS tags,
+        CASE
+            WHEN TASK.{IS_INBOX} THEN 'Inbox'
+            WHEN TASK.{IS_ANYTIME} THEN 'Anytime'
+            WHEN TASK.{IS_SOMEDAY} THEN 'Someday'
+        END AS start,
+        CASE
+            WHEN EXISTS (
+                SELECT 1 FROM {TABLE_CHECKLIST_ITEM} WHERE task = TASK.uuid
+            ) THEN 1
+        END AS checklist,
+        TASK.{DATE_START} AS start_date,
+        TASK.{DATE_DEADLINE} AS deadline,
+        TASK.stopDate AS "stop_date",
+        TASK.{DATE_CREATED} AS created,
+        TASK.{DATE_MODIFIED} AS modified,
+        TASK.'index',
+        TASK.todayIndex AS today_index
+    """
+).strip()
+
+TASKS_SQL_TABLES = dedent(
+    f"""
+    FROM
+        {TABLE_TASK} AS TASK
+    LEFT OUTER JOIN
+        {TABLE_TASK} PROJECT ON TASK.project = PROJECT.uuid
+    LEFT OUTER JOIN
+        {TABLE_AREA} AREA ON TASK.area = AREA.uuid
+    LEFT OUTER JOIN
+        {TABLE_TASK} HEADING ON TASK.actionGroup = HEADING.uuid
+    LEFT OUTER JOIN
+        {TABLE_TASK} PROJECT_OF_HEADING
+        ON HEADING.project = PROJECT_OF_HEADING.uuid
+    """
+).strip()
+
+TASKS_SQL_QUERY_TEMPLATE = f"""{TASKS_SQL_SELECT}
+{TASKS_SQL_TABLES}
+WHERE
+    {{where_predicate}}
+ORDER BY
+    {{order_predicate}}"""
+
+# Counting tasks needs neither the columns nor the order of the tasks query.
+TASKS_COUNT_SQL_QUERY_TEMPLATE = f"""SELECT
+    COUNT(*)
+{TASKS_SQL_TABLES}
+WHERE
+    {{where_predicate}}"""
+
+
+def resolve_filepath(filepath):
+    """
+    Return the filepath of the database, following a moved database.
+
+    Things 3.12.6/3.13.1 moved the database and left a text file behind
+    at the old location. The result is cached per filepath until the
+    file is modified, so the file is only read again once it changes.
+    """
+    try:
+        mtime = os.stat(filepath).st_mtime_ns
+    except (FileNotFoundError, PermissionError):
+        return filepath  # doesn't exist or can't be read
+
+    cached_mtime, resolved_filepath = RESOLVED_FILEPATHS.get(filepath, (None, None))
+    if resolved_filepath is None or cached_mtime != mtime:
+        resolved_filepath = resolve_moved_filepath(filepath)
+        RESOLVED_FILEPATHS[filepath] = (mtime, resolved_filepath)
+    return resolved_filepath
+
+
+def resolve_moved_filepath(filepath):
+    """Check the start of a file, read as bytes, for the moved database note."""
+    try:
+        with open(filepath, "rb") as file:
+            start = file.read(len(SQLITE_FILE_HEADER))
+            if start == SQLITE_FILE_HEADER:
+                return filepath  # an actual database
+            if b"Your database file has been moved there" in (
+                start + file.readline(1024)
+            ):
+                return DEFAULT_FILEPATH
+    except (FileNotFoundError, PermissionError):
+        pass  # doesn't exist or can't be read
+    return filepath
+
+
+def batched(values, size=MAX_SQL_PARAMETERS):
+    """
+    Split values into tuples of at most `size` items.
+
+    Examples
+    --------
+    >>> batched(['a', 'b', 'c'], size=2)
+    [('a', 'b'), ('c',)]
+    """
+    values = tuple(values)
+    return [values[start : start + size] for start in range(0, len(values), size)]
+
+
+def make_placeholders(values):
+    """
+    Return SQL parameter placeholders for an `IN (...)` list of values.
+
+    Examples
+    --------
+    >>> make_placeholders(['a', 'b', 'c'])
+    '?, ?, ?'
+    """
+    return ", ".join("?" * len(values))
+
+
+def join_filters(filters):
+    """
+    Join SQL filters into one predicate, skipping empty filters.
+
+    Examples
+    --------
+    >>> print(join_filters(['TRUE', '', 'AND title = ?']))
+    TRUE
+    AND title = ?
+    """
+    return "\n".join(filter(None, filters))
+
+
+@functools.lru_cache(maxsize=64)
 def make_tasks_sql_query(where_predicate=None, order_predicate=None):
-    """Make SQL query for Task table."""
-    where_predicate = where_predicate or "TRUE"
-    order_predicate = order_predicate or 'TASK."index"'
+    """
+    Make SQL query for Task table.
+
+    Values are bound as parameters, so the predicates only depend on which
+    filters are used, and the few distinct queries are cached.
+    """
+    return TASKS_SQL_QUERY_TEMPLATE.format(
+        where_predicate=where_predicate or "TRUE",
+        order_predicate=order_predicate or 'TASK."index"',
+    )
 
-    return f"""
-            SELECT DISTINCT
-                TASK.uuid,
-                CASE
-                    WHEN TASK.{IS_TODO} THEN 'to-do'
-                    WHEN TASK.{IS_PROJECT} THEN 'project'
-                    WHEN TASK.{IS_HEADING} THEN 'heading'
-                END AS type,
-                CASE
-                    WHEN TASK.{IS_TRASHED} THEN 1
-                END AS trashed,
-                TASK.title,
-                CASE
-                    WHEN TASK.{IS_INCOMPLETE} THEN 'incomplete'
-                    WHEN TASK.{IS_CANCELED} THEN 'canceled'
-                    WHEN TASK.{IS_COMPLETED} THEN 'completed'
-                END AS status,
-                CASE
-                    WHEN AREA.uuid IS NOT NULL THEN AREA.uuid
-                END AS area,
-                CASE
-                    WHEN AREA.uuid IS NOT NULL THEN AREA.title
-                END AS area_title,
-                CASE
-                    WHEN PROJECT.uuid IS NOT NULL THEN PROJECT.uuid
-                END AS project,
-                CASE
-                    WHEN PROJECT.uuid IS NOT NULL THEN PROJECT.title
-                END AS project_title,
-                CASE
-                    WHEN HEADING.uuid IS NOT NULL THEN HEADING.uuid
-                END AS heading,
-                CASE
-                    WHEN HEADING.uuid IS NOT NULL THEN HEADING.title
-                END AS heading_title,
-                TASK.notes,
-                CASE
-                    WHEN TAG.uuid IS NOT NULL THEN 1
-                END AS tags,
-                CASE
-                    WHEN TASK.{IS_INBOX} THEN 'Inbox'
-                    WHEN TASK.{IS_ANYTIME} THEN 'Anytime'
-                    WHEN TASK.{IS_SOMEDAY} THEN 'Someday'
-                END AS start,
-                CASE
-                    WHEN CHECKLIST_ITEM.uuid IS NOT NULL THEN 1
-                END AS checklist,
-                date(TASK.startDate, "unixepoch", "localtime") AS start_date,
-                date(TASK.{DATE_DEADLINE}, "unixepoch", "localtime") AS deadline,
-                date(TASK.stopDate, "unixepoch", "localtime") AS "stop_date",
-                datetime(TASK.{DATE_CREATED}, "unixepoch", "localtime") AS created,
-                datetime(TASK.{DATE_MODIFIED}, "unixepoch", "localtime") AS modified,
-                TASK.'index',
-                TASK.todayIndex AS today_index
-            FROM
-                {TABLE_TASK} AS TASK
-            LEFT OUTER JOIN
-                {TABLE_TASK} PROJECT ON TASK.project = PROJECT.uuid
-            LEFT OUTER JOIN
-                {TABLE_AREA} AREA ON TASK.area = AREA.uuid
-            LEFT OUTER JOIN
-                {TABLE_TASK} HEADING ON TASK.actionGroup = HEADING.uuid
-            LEFT OUTER JOIN
-                {TABLE_TASK} PROJECT_OF_HEADING
-                ON HEADING.project = PROJECT_OF_HEADING.uuid
-            LEFT OUTER JOIN
-                {TABLE_TASKTAG} TAGS ON TASK.uuid = TAGS.tasks
-            LEFT OUTER JOIN
-                {TABLE_TAG} TAG ON TAGS.tags = TAG.uuid
-            LEFT OUTER JOIN
-                {TABLE_CHECKLIST_ITEM} CHECKLIST_ITEM
-                ON TASK.uuid = CHECKLIST_ITEM.task
-            WHERE
-                {where_predicate}
-            ORDER BY
-                {order_predicate}
-            """
 
+@functools.lru_cache(maxsize=64)
+def make_tasks_count_sql_query(where_predicate=None):
+    """Make SQL query that counts the tasks matching `where_predicate`."""
+    return TASKS_COUNT_SQL_QUERY_TEMPLATE.format(
+        where_predicate=where_predicate or "TRUE"
+    )
 
-def dict_factory(cursor, row):
+
+@functools.lru_cache(maxsize=64)
+def make_dict_factory(description):
     """
-    Convert SQL result into a dictionary.
+    Return a row factory that converts SQL results into dictionaries.
+
+    The columns in `description` are looked up once per set of columns,
+    so that converting a row only walks a prepared plan of its columns.
 
     See also:
     https://docs.python.org/3/library/sqlite3.html#sqlite3.Connection.row_factory
     """
-    result = {}
-    for index, column in enumerate(cursor.description):
-        key, value = column[0], row[index]
-        if value is None and key in COLUMNS_TO_OMIT_IF_NONE:
-            continue
-        if value and key in COLUMNS_TO_TRANSFORM_TO_BOOL:
-            value = bool(value)
-        result[key] = value
-    return result
+    plan = [
+        (key, key in COLUMNS_TO_OMIT_IF_NONE, get_column_transform(key))
+        for key, *_ in description
+    ]
+
+    if not any(omit_if_none or transform for _, omit_if_none, transform in plan):
+        # Nothing to omit or transform: build the dict entirely in C.
+        keys = tuple(key for key, _, _ in plan)
+        return lambda _cursor, row: dict(zip(keys, row))
+
+    def dict_factory(_cursor, row):
+        result = {}
+        for (key, omit_if_none, transform), value in zip(plan, row):
+            if value is None:
+                if omit_if_none:
+                    continue
+            elif transform:
+                value = transform(value)
+            result[key] = value
+        return result
 
+    return dict_factory
 
-def escape_string(string):
-    r"""
-    Escape SQLite string literal.
 
-    Three notes:
+def get_column_transform(key):
+    """Return the function that transforms non-null values of a column."""
+    if key in COLUMNS_TO_TRANSFORM_TO_BOOL:
+        return bool
+    if key in COLUMNS_TO_TRANSFORM_TO_DATE:
+        return unixtime_to_isodate
+    if key in COLUMNS_TO_TRANSFORM_TO_DATETIME:
+        return unixtime_to_isodatetime
+    return None
 
-    1. A single quote within a SQLite string can be encoded by putting
-    two single quotes in a row. Escapes using the backslash character
-    are not supported in SQLite.
 
-    2. Null characters '\0' within strings can lead to surprising
-    behavior. However, `cursor.execute` will already throw a `ValueError`
-    if it finds a null character in the query, so we let it handle
-    this case for us.
+def unixtime_to_isodate(unixtime):
+    """
+    Convert a unix timestamp to an ISO date in local time.
+
+    Same as SQLite's `date(unixtime, 'unixepoch', 'localtime')`.
+    """
+    return datetime.fromtimestamp(round(unixtime, 3)).date().isoformat()
 
-    3. Eventually we might want to make use of parameters instead of
-    manually escaping. Since this will require some refactoring,
-    we are going with the easiest solution for now.
 
-    See: https://www.sqlite.org/lang_expr.html#literal_values_constants_
+def unixtime_to_isodatetime(unixtime):
+    """
+    Convert a unix timestamp to an ISO datetime in local time.
+
+    Same as SQLite's `datetime(unixtime, 'unixepoch', 'localtime')`,
+    which also rounds to milliseconds before cutting off fractions.
+
+    Examples
+    --------
+    >>> unixtime_to_isodatetime(0.9996) == unixtime_to_isodatetime(1)
+    True
     """
-    return string.replace("'", "''")
+    return datetime.fromtimestamp(round(unixtime, 3)).isoformat(" ", "seconds")
 
 
 def list_factory(_cursor, row):
@@ -600,35 +875,88 @@ def list_factory(_cursor, row):
 
 def make_filter(column, value):
     """
-    Return SQL filter 'AND {column} = "{value}"'.
+    Return SQL filter 'AND {column} = ?' and its parameters.
 
     Special handling if `value` is `bool` or `None`.
 
     Examples
     --------
     >>> make_filter('title', 'Important')
-    "AND title = 'Important'"
+    ('AND title = ?', ('Important',))
 
     >>> make_filter('startDate', True)
-    'AND startDate IS NOT NULL'
+    ('AND startDate IS NOT NULL', ())
 
     >>> make_filter('startDate', False)
-    'AND startDate IS NULL'
+    ('AND startDate IS NULL', ())
 
     >>> make_filter('title', None)
-    ''
+    ('', ())
+    """
+    if value is None:
+        return "", ()
+    if value in (False, True):  # also 0 and 1, which `validate` accepts
+        condition = "IS NOT NULL" if value else "IS NULL"
+        return f"AND {column} {condition}", ()
+    return f"AND {column} = ?", (value,)
+
+
+def make_tag_filter(tag):
+    """
+    Return SQL filter for tasks that have a tag titled `tag`, and its parameters.
+
+    The tags are looked up with `EXISTS`, which stops at the first match
+    and does not add a row to the result for every tag of a task.
+
+    Examples
+    --------
+    >>> make_tag_filter('Errand') #doctest: +NORMALIZE_WHITESPACE
+    ('AND EXISTS (SELECT 1 FROM TMTaskTag AS TASK_TAG JOIN TMTag AS TAG
+      ON TAG.uuid = TASK_TAG.tags
+      WHERE TASK_TAG.tasks = TASK.uuid AND TAG.title = ?)', ('Errand',))
+
+    >>> make_tag_filter(None)
+    ('', ())
     """
-    default = f"AND {column} = '{escape_string(str(value))}'"
-    return {
-        None: "",
-        False: f"AND {column} IS NULL",
-        True: f"AND {column} IS NOT NULL",
-    }.get(value, default)
+    if tag is None:
+        return "", ()
 
+    tagged_tasks = (
+        f"SELECT 1 FROM {TABLE_TASKTAG} AS TASK_TAG JOIN {TABLE_TAG} AS TAG"
+        " ON TAG.uuid = TASK_TAG.tags"
+        " WHERE TASK_TAG.tasks = TASK.uuid AND TAG.title = ?"
+    )
+    return f"AND EXISTS ({tagged_tasks})", (tag,)
 
-def make_date_filter(date_column: str, value) -> str:
+
+def make_area_tag_filter(tag):
+    """
+    Return SQL filter for areas that have a tag titled `tag`, and its parameters.
+
+    Examples
+    --------
+    >>> make_area_tag_filter('Errand') #doctest: +NORMALIZE_WHITESPACE
+    ('AND EXISTS (SELECT 1 FROM TMAreaTag AS AREA_TAG JOIN TMTag AS TAG
+      ON TAG.uuid = AREA_TAG.tags
+      WHERE AREA_TAG.areas = AREA.uuid AND TAG.title = ?)', ('Errand',))
+
+    >>> make_area_tag_filter(None)
+    ('', ())
     """
-    Return a SQL filter for date columns.
+    if tag is None:
+        return "", ()
+
+    tagged_areas = (
+        f"SELECT 1 FROM {TABLE_AREATAG} AS AREA_TAG JOIN {TABLE_TAG} AS TAG"
+        " ON TAG.uuid = AREA_TAG.tags"
+        " WHERE AREA_TAG.areas = AREA.uuid AND TAG.title = ?"
+    )
+    return f"AND EXISTS ({tagged_areas})", (tag,)
+
+
+def make_date_filter(date_column: str, value):
+    """
+    Return a SQL filter for date columns and its parameters.
 
     Parameters
     ----------
@@ -642,41 +970,47 @@ def make_date_filter(date_column: str, value) -> str:
 
     Returns
     -------
-    str
-        A date filter for the SQL query. If `value == None`, then
-        return the empty string.
+    tuple of str and tuple
+        A date filter for the SQL query and its parameters. If
+        `value == None`, then return the empty string.
+
+        Dates are compared as unix timestamps against the start of
+        tomorrow in local time, which is computed once per call rather
+        than converting the column to a local date for every row. Like
+        the returned dates, timestamps are rounded to milliseconds.
 
     Examples
     --------
     >>> make_date_filter('start_date', True)
-    'AND start_date IS NOT NULL'
+    ('AND start_date IS NOT NULL', ())
 
     >>> make_date_filter('start_date', False)
-    'AND start_date IS NULL'
+    ('AND start_date IS NULL', ())
 
     >>> make_date_filter('start_date', 'future')
-    "AND date(start_date, 'unixepoch', 'localtime') > date('now', 'localtime')"
+    ('AND start_date >= ?', (...,))
 
     >>> make_date_filter('created', None)
-    ''
+    ('', ())
 
     """
     if value is None:
-        return ""
+        return "", ()
 
-    if isinstance(value, bool):
+    if value is True or value is False:
         return make_filter(date_column, value)
 
-    # compare `date_column` to now.
-    validate("value", value, ["future", "past"])
-    date = f"date({date_column}, 'unixepoch', 'localtime')"
-    operator = ">" if value == "future" else "<="
-    now = "date('now', 'localtime')"
+    # compare `date_column` to the start of tomorrow.
+    validate("value", value, RELATIVE_DATES)
+    operator = RELATIVE_DATE_TO_OPERATOR[value]
+    tomorrow = datetime.combine(date.today() + timedelta(days=1), time())
+    # A timestamp rounds up to tomorrow from half a millisecond before it.
+    threshold = tomorrow.timestamp() - 0.0005
 
-    return f"AND {date} {operator} {now}"
+    return f"AND {date_column} {operator} ?", (threshold,)
 
 
-def make_date_range_filter(date_column, offset) -> str:
+def make_date_range_filter(date_column, offset):
     """
     Return a SQL filter to limit a date to last X days, weeks, or years.
 
@@ -692,37 +1026,42 @@ def make_date_range_filter(date_column, offset) -> str:
 
     Returns
     -------
-    str
-        A date filter for the SQL query. If `offset == None`, then
-        return the empty string.
+    tuple of str and tuple
+        A date filter for the SQL query and its parameters. If
+        `offset == None`, then return the empty string.
+
+        The cutoff is computed as a unix timestamp and bound as a
+        parameter, so that the column is compared as stored and the
+        query text stays the same.
 
     Examples
     --------
     >>> make_date_range_filter('created', '3d')
-    "AND datetime(created, 'unixepoch') > datetime('now', '-3 days')"
+    ('AND created > ?', (...,))
 
     >>> make_date_range_filter('created', None)
-    ''
+    ('', ())
     """
     if offset is None:
-        return ""
-
-    validate_offset("offset", offset)
-    number, suffix = int(offset[:-1]), offset[-1]
+        return "", ()
 
-    if suffix == "d":
-        modifier = f"-{number} days"
-    elif suffix == "w":
-        modifier = f"-{number * 7} days"
-    elif suffix == "y":
-        modifier = f"-{number} years"
+    number, suffix = parse_offset("offset", offset)
+    now = datetime.now(timezone.utc)
 
-    column_datetime = f"datetime({date_column}, 'unixepoch')"
-    offset_datetime = f"datetime('now', '{modifier}')"  # type: ignore
+    try:
+        if suffix == "y":
+            # Like SQLite, let February 29 roll over into March 1.
+            cutoff = now.replace(year=now.year - number, day=1)
+            cutoff += timedelta(days=now.day - 1)
+        else:
+            cutoff = now - timedelta(days=number * DAYS_PER_OFFSET_UNIT[suffix])
+    except (OverflowError, ValueError):
+        cutoff = datetime.min.replace(tzinfo=timezone.utc)  # before any date
 
-    return f"AND {column_datetime} > {offset_datetime}"
+    return f"AND {date_column} > ?", (cutoff.timestamp(),)
 
 
+@functools.lru_cache(maxsize=None)
 def make_truthy_filter(column: str, value) -> str:
     """
     Return a SQL filter that matches if a column is truthy or falsy.
@@ -752,34 +1091,39 @@ def make_truthy_filter(column: str, value) -> str:
     return f"AND NOT IFNULL({column}, 0)"
 
 
-def make_search_filter(query: str) -> str:
+def make_search_filter(query: str):
     """
-    Return a SQL filter to search tasks by a string query.
+    Return a SQL filter to search tasks by a string query and its parameters.
 
     Example:
     --------
-    >>> make_search_filter('dinner') #doctest: +REPORT_NDIFF
-    "AND (TASK.title LIKE '%dinner%' OR TASK.notes LIKE '%dinner%' OR AREA.title LIKE '%dinner%')"
+    >>> make_search_filter('dinner') #doctest: +NORMALIZE_WHITESPACE
+    ('AND (TASK.title LIKE ? OR TASK.notes LIKE ? OR AREA.title LIKE ?)',
+     ('%dinner%', '%dinner%', '%dinner%'))
     """
     if not query:
-        return ""
+        return "", ()
 
-    query = escape_string(query)
+    # SQLite stops matching a LIKE pattern at the first null character.
+    if "\0" in query:
+        raise ValueError(f"Invalid search query: {query!r}")
 
     # noqa todo 'TMChecklistItem.title'
     columns = ["TASK.title", "TASK.notes", "AREA.title"]
 
-    sub_searches = (f"{column} LIKE '%{query}%'" for column in columns)
+    sub_searches = (f"{column} LIKE ?" for column in columns)
+    parameters = (f"%{query}%",) * len(columns)
 
-    return f"AND ({' OR '.join(sub_searches)})"
+    return f"AND ({' OR '.join(sub_searches)})", parameters
 
 
+@functools.lru_cache(maxsize=256)
 def prettify_sql(sql_query):
     """Make a SQL query easier to read for humans."""
     # remove indentation and leading and trailing whitespace
     result = dedent(sql_query).strip()
     # remove empty lines
-    return re.sub(r"^$\n", "", result, flags=re.MULTILINE)
+    return EMPTY_LINE_PATTERN.sub("", result)
 
 
 def validate(parameter, argument, valid_arguments):
@@ -810,7 +1154,7 @@ def validate(parameter, argument, valid_arguments):
     if argument in valid_arguments:
         return
     message = f"Unrecognized {parameter} type: {argument!r}"
-    message += f"\nValid {parameter} types are {valid_arguments}"
+    message += f"\nValid {parameter} types are {list(valid_arguments)}"
     raise ValueError(message)
 
 
@@ -833,6 +1177,26 @@ def validate_offset(parameter, argument):
     if argument is None:
         return
 
+    parse_offset(parameter, argument)
+
+
+def parse_offset(parameter, argument):
+    """
+    Split an offset argument into its number and its suffix.
+
+    If the argument is not a valid offset, then raise `ValueError`.
+
+    Examples
+    --------
+    >>> parse_offset(parameter='last', argument='3d')
+    (3, 'd')
+
+    >>> parse_offset(parameter='last', argument='Xd')
+    Traceback (most recent call last):
+    ...
+    ValueError: Invalid last argument: 'Xd'
+    Please specify a string of the format 'X[d/w/y]' where X is ...
+    """
     if not isinstance(argument, str):
         raise ValueError(
             f"Invalid {parameter} argument: {argument!r}\n"
@@ -840,10 +1204,16 @@ def validate_offset(parameter, argument):
         )
 
     suffix = argument[-1:]  # slicing here to handle empty strings
-    if suffix not in ("d", "w", "y"):
+    try:
+        if suffix not in ("d", "w", "y"):
+            raise ValueError
+        number = int(argument[:-1])
+    except ValueError:
         raise ValueError(
             f"Invalid {parameter} argument: {argument!r}\n"
             f"Please specify a string of the format 'X[d/w/y]' "
             "where X is a non-negative integer followed by 'd', 'w', or 'y' "
             "that indicates days, weeks, or years."
-        )
+        ) from None
+
+    return number, suffix